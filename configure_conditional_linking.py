@@ -4,75 +4,53 @@ Script to configure conditional linking for different iOS platforms
 This allows using different libraries for device vs simulator
 """
 
-import os
-import sys
+from pbxproj_editor import PROJECT_PATH, run
 
-def configure_xcode_project():
-    project_path = "/Users/nikitakrivonosov/Documents/DJVUReader-iOS/DJVUReader-iOS.xcodeproj/project.pbxproj"
-    
-    if not os.path.exists(project_path):
-        print(f"❌ Project file not found: {project_path}")
-        return False
-    
-    print(f"📝 Configuring conditional linking: {project_path}")
-    
-    # Read the project file
-    with open(project_path, 'r') as f:
-        content = f.read()
-    
-    # Backup the original
-    backup_path = project_path + ".conditional_backup"
-    with open(backup_path, 'w') as f:
-        f.write(content)
-    print(f"💾 Created backup: {backup_path}")
+# Debug and Release configurations of the DJVUReader-iOS target
+_TARGET_CONFIGURATIONS = ('E0C520F82DF4C8C7009D84A3', 'E0C520F92DF4C8C7009D84A3')
+
+# Library picked by DJVU_LIBRARY_FLAG for each SDK
+_LIBRARY_FLAGS = (
+    ('"DJVU_LIBRARY_FLAG[sdk=iphoneos*]"', '"-ldjvulibre_device"'),
+    ('"DJVU_LIBRARY_FLAG[sdk=iphonesimulator*]"', '"-ldjvulibre_simulator"'),
+)
+
+def apply_configuration(project):
+    """Switch the app target to per-SDK library flags and return True if anything changed"""
+    modified = False
     
     # Replace OTHER_LDFLAGS to use conditional linking
-    debug_pattern = 'OTHER_LDFLAGS = (\n\t\t\t\t\t"$(inherited)",\n\t\t\t\t\t"-ldjvulibre",\n\t\t\t\t);'
-    release_pattern = 'OTHER_LDFLAGS = (\n\t\t\t\t\t"$(inherited)",\n\t\t\t\t\t"-ldjvulibre",\n\t\t\t\t);'
-    
-    conditional_ldflags = '''OTHER_LDFLAGS = (
-					"$(inherited)",
-					"$(DJVU_LIBRARY_FLAG)",
-				);'''
-    
-    # Replace for both Debug and Release configurations
-    if debug_pattern in content:
-        content = content.replace(debug_pattern, conditional_ldflags)
-        print("✅ Updated Debug OTHER_LDFLAGS")
-    
-    if release_pattern in content:
-        content = content.replace(release_pattern, conditional_ldflags)
-        print("✅ Updated Release OTHER_LDFLAGS")
-    
-    # Add user-defined build settings section before the existing buildSettings
-    debug_build_start = 'E0C520F82DF4C8C7009D84A3 /* Debug */ = {\n\t\t\tisa = XCBuildConfiguration;\n\t\t\tbuildSettings = {'
-    release_build_start = 'E0C520F92DF4C8C7009D84A3 /* Release */ = {\n\t\t\tisa = XCBuildConfiguration;\n\t\t\tbuildSettings = {'
-    
-    # Add DJVU_LIBRARY_FLAG setting for Debug
-    debug_replacement = '''E0C520F82DF4C8C7009D84A3 /* Debug */ = {
-			isa = XCBuildConfiguration;
-			buildSettings = {
-				"DJVU_LIBRARY_FLAG[sdk=iphoneos*]" = "-ldjvulibre_device";
-				"DJVU_LIBRARY_FLAG[sdk=iphonesimulator*]" = "-ldjvulibre_simulator";'''
-    
-    # Add DJVU_LIBRARY_FLAG setting for Release  
-    release_replacement = '''E0C520F92DF4C8C7009D84A3 /* Release */ = {
-			isa = XCBuildConfiguration;
-			buildSettings = {
-				"DJVU_LIBRARY_FLAG[sdk=iphoneos*]" = "-ldjvulibre_device";
-				"DJVU_LIBRARY_FLAG[sdk=iphonesimulator*]" = "-ldjvulibre_simulator";'''
-    
-    if debug_build_start in content:
-        content = content.replace(debug_build_start, debug_replacement)
-        print("✅ Added conditional library flags for Debug")
-    
-    if release_build_start in content:
-        content = content.replace(release_build_start, release_replacement)
-        print("✅ Added conditional library flags for Release")
+    static_ldflags = '(\n\t\t\t\t\t"$(inherited)",\n\t\t\t\t\t"-ldjvulibre",\n\t\t\t\t)'
+    conditional_ldflags = '(\n\t\t\t\t\t"$(inherited)",\n\t\t\t\t\t"$(DJVU_LIBRARY_FLAG)",\n\t\t\t\t)'
+    
+    for uuid in _TARGET_CONFIGURATIONS:
+        configuration = project.configurations.get(uuid)
+        if configuration is None:
+            continue
+        
+        if project.get(uuid, 'OTHER_LDFLAGS') == static_ldflags:
+            project.set(uuid, 'OTHER_LDFLAGS', conditional_ldflags)
+            modified = True
+            print(f"✅ Updated {configuration.name} OTHER_LDFLAGS")
+        
+        # Add DJVU_LIBRARY_FLAG settings that are missing or out of date
+        added_flags = False
+        for key, value in _LIBRARY_FLAGS:
+            if project.get(uuid, key) != value:
+                project.set(uuid, key, value)
+                added_flags = True
+        if added_flags:
+            modified = True
+            print(f"✅ Added conditional library flags for {configuration.name}")
+    
+    return modified
+
+def configure_xcode_project():
+    print(f"📝 Configuring conditional linking: {PROJECT_PATH}")
     
-    # Write the modified content back
-    with open(project_path, 'w') as f:
-        f.write(content)
+    modified = run(__file__, apply_configuration, ".conditional_backup")
+    if modified is None:
+        return False
     
     print("✅ Project configured for conditional linking")
     print("\n📚 Libraries created:")
@@ -84,4 +62,4 @@ def configure_xcode_project():
 
 if __name__ == "__main__":
     success = configure_xcode_project()
-    sys.exit(0 if success else 1)
\ No newline at end of file
+    raise SystemExit(0 if success else 1)
\ No newline at end of file
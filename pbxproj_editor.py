@@ -0,0 +1,329 @@
+"""
+Shared helpers for the configure_*.py scripts
+Maps project.pbxproj once, exposes the build settings of every XCBuildConfiguration
+as a dictionary and writes the edited project back in a single pass
+"""
+
+import hashlib
+import mmap
+import os
+import re
+import shutil
+
+PROJECT_PATH = "/Users/nikitakrivonosov/Documents/DJVUReader-iOS/DJVUReader-iOS.xcodeproj/project.pbxproj"
+
+# Marker files recording which project contents each script has already produced
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "djvureader")
+
+def _file_sha256(path):
+    with open(path, 'rb') as f:
+        # hashlib.file_digest needs Python 3.11, the system Python on macOS is older
+        if hasattr(hashlib, 'file_digest'):
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+        digest = hashlib.sha256()
+        for block in iter(lambda: f.read(1 << 16), b''):
+            digest.update(block)
+        return digest.hexdigest()
+
+def _marker_path(path, script):
+    # The script and this module are part of the key, so changing the values a script
+    # writes (or how they are written) invalidates the markers of earlier versions
+    name = os.path.splitext(os.path.basename(script))[0]
+    code = hashlib.sha256((_file_sha256(script) + _file_sha256(__file__)).encode('ascii')).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, f"pbxproj-{name}-{code}-{_file_sha256(path)}.done")
+
+def already_configured(path, script):
+    """Return True if this version of the script file has already produced the current contents of the project"""
+    return os.path.exists(_marker_path(path, script))
+
+def mark_configured(path, script):
+    """Remember that the current contents of the project need no further changes from the script file"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(_marker_path(path, script), 'w'):
+        pass
+
+# Everything the editor needs from the project text, found in a single left-to-right pass
+# Any line mentioning a static library contains a `library` match, wherever the name sits in it
+_TOKEN_RE = re.compile(rb'(?P<configuration>isa = XCBuildConfiguration;)|(?P<library>lib[\w-]*\.a)')
+
+class BuildConfiguration:
+    """A single XCBuildConfiguration block with its build settings keyed by name"""
+
+    def __init__(self, uuid, name, settings, indent, start, end):
+        self.uuid = uuid
+        self.name = name
+        self.settings = settings
+        self.indent = indent
+        # Span of the settings lines in the parsed text
+        self.start = start
+        self.end = end
+
+    def serialize(self):
+        return ''.join(f'{self.indent}{key} = {value};\n' for key, value in self.settings.items()).encode('utf-8')
+
+def _parse_configuration(content, pos):
+    """Parse the XCBuildConfiguration whose isa line is at pos"""
+    # The object header is the line above the isa line: `UUID /* Name */ = {`
+    isa_start = content.rfind(b'\n', 0, pos) + 1
+    header = content[content.rfind(b'\n', 0, isa_start - 1) + 1:isa_start].strip().decode('utf-8')
+    uuid = header.split(' ', 1)[0]
+    name = header[header.find('/*') + 2:header.find('*/')].strip()
+
+    settings_open = content.find(b'buildSettings = {', pos)
+    if settings_open == -1:
+        raise ValueError(f"XCBuildConfiguration {uuid} has no buildSettings")
+    indent = content[content.rfind(b'\n', 0, settings_open) + 1:settings_open].decode('utf-8') + '\t'
+    start = content.find(b'\n', settings_open) + 1
+
+    # One `KEY = VALUE;` per line, except lists which run until a `);` line
+    settings = {}
+    line_start = start
+    while True:
+        line_end = content.find(b'\n', line_start)
+        if line_end == -1:
+            raise ValueError(f"XCBuildConfiguration {uuid} ends inside its buildSettings")
+        line = content[line_start:line_end].strip()
+        if line == b'};':
+            break
+        key, _, value = line.partition(b' = ')
+        value_start = content.find(b' = ', line_start) + 3
+        if value == b'(':
+            while content[line_start:line_end].strip() != b');':
+                if line_end == -1:
+                    raise ValueError(f"XCBuildConfiguration {uuid} ends inside the {key.decode('utf-8')} list")
+                line_start = line_end + 1
+                line_end = content.find(b'\n', line_start)
+        value_end = content.rfind(b';', line_start, line_end)
+        settings[key.decode('utf-8')] = content[value_start:value_end].decode('utf-8')
+        line_start = line_end + 1
+
+    return BuildConfiguration(uuid, name, settings, indent, start, line_start)
+
+def scan_project(content):
+    """Walk the raw project bytes or mapping once
+
+    Returns {uuid: BuildConfiguration} for every XCBuildConfiguration and
+    the (start, end) spans of the lines outside them that mention a static library
+    """
+    # Only the setting keys and values are decoded, everything else stays bytes
+    configurations = {}
+    library_lines = []
+    match = _TOKEN_RE.search(content)
+    while match:
+        if match.lastgroup == 'configuration':
+            configuration = _parse_configuration(content, match.start())
+            configurations[configuration.uuid] = configuration
+            pos = configuration.end
+        else:
+            start = content.rfind(b'\n', 0, match.start()) + 1
+            pos = content.find(b'\n', match.end()) + 1 or len(content)
+            library_lines.append((start, pos))
+        match = _TOKEN_RE.search(content, pos)
+    return configurations, library_lines
+
+class PBXProj:
+    """In-memory view of a project.pbxproj file"""
+
+    def __init__(self, path=PROJECT_PATH):
+        self.path = path
+        # The file is mapped rather than read, so text that is not edited is
+        # copied straight from the page cache to the output in write()
+        with open(path, 'rb') as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # mmap refuses zero-length files
+                raise ValueError(f"Project file is empty: {path}") from None
+
+        try:
+            self.configurations, self._library_lines = scan_project(self._map)
+        except ValueError:
+            self.close()
+            raise
+
+        # (start, end) spans of untouched text and build configurations, in file order
+        self._chunks = []
+        pos = 0
+        for configuration in self.configurations.values():
+            self._chunks.append((pos, configuration.start))
+            self._chunks.append(configuration)
+            pos = configuration.end
+        self._chunks.append((pos, len(self._map)))
+
+    def close(self):
+        """Release the mapping of the project file"""
+        self._map.close()
+
+    def backup(self, suffix, link=False):
+        """Snapshot the project file next to it and return the backup path
+
+        Pass link=True only right before write(): it replaces the project with a new inode,
+        so a hard link then keeps the original contents without copying them
+        """
+        backup_path = self.path + suffix
+        try:
+            os.remove(backup_path)
+        except FileNotFoundError:
+            pass
+        if link:
+            try:
+                os.link(self.path, backup_path)
+                return backup_path
+            except OSError:
+                pass
+        shutil.copyfile(self.path, backup_path)
+        return backup_path
+
+    def write(self):
+        """Write the project back through a temporary file and release the mapping"""
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, 'wb') as f, memoryview(self._map) as view:
+                for chunk in self._chunks:
+                    if isinstance(chunk, tuple):
+                        with view[chunk[0]:chunk[1]] as text:
+                            f.write(text)
+                    else:
+                        f.write(chunk.serialize())
+            self.close()
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            # Leave the project untouched and no partial temporary file behind
+            self.close()
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def get(self, uuid, key):
+        return self.configurations[uuid].settings.get(key)
+
+    def set(self, uuid, key, value):
+        self.configurations[uuid].settings[key] = value
+
+    def remove(self, uuid, key):
+        return self.configurations[uuid].settings.pop(key, None) is not None
+
+    def has_setting(self, key):
+        """Return True if any build configuration defines the setting"""
+        return any(key in configuration.settings for configuration in self.configurations.values())
+
+    def has_value(self, text):
+        """Return True if any build setting value mentions the text"""
+        return any(
+            text in value
+            for configuration in self.configurations.values()
+            for value in configuration.settings.values()
+        )
+
+    def replace_setting(self, key, value):
+        """Replace the setting wherever it is defined and return the number of configurations changed"""
+        count = 0
+        for configuration in self.configurations.values():
+            if key in configuration.settings:
+                configuration.settings[key] = value
+                count += 1
+        return count
+
+    def append_to_setting(self, key, item):
+        """Append an item to the setting wherever it is defined and missing, turning single values into lists"""
+        count = 0
+        for configuration in self.configurations.values():
+            value = configuration.settings.get(key)
+            if value is None:
+                continue
+            item_indent = configuration.indent + '\t'
+            if value.startswith('('):
+                items = value[1:value.rindex(')')].rstrip()
+                if any(line.strip().rstrip(',') == item for line in items.split('\n')):
+                    continue
+            elif value == item:
+                continue
+            else:
+                items = f'\n{item_indent}{value},'
+            configuration.settings[key] = f'({items}\n{item_indent}{item},\n{configuration.indent})'
+            count += 1
+        return count
+
+    def remove_setting(self, key):
+        """Remove the setting from every configuration and return the number of configurations changed"""
+        return sum(self.remove(uuid, key) for uuid in self.configurations)
+
+    def add_to_build_settings(self, settings):
+        """Add each {key: value} setting to every configuration that does not define it yet"""
+        count = 0
+        for configuration in self.configurations.values():
+            for key, value in settings.items():
+                if key not in configuration.settings:
+                    configuration.settings[key] = value
+                    count += 1
+        return count
+
+    def remove_library_references(self, libraries):
+        """Drop every line that references one of the static libraries and return the number removed"""
+        # Candidate lines were located while scanning, so only those are searched for the names
+        # and removing them just splits the untouched spans
+        names = [library.encode('utf-8') for library in libraries]
+        dropped = [
+            (start, end) for start, end in self._library_lines
+            if any(self._map.find(name, start, end) != -1 for name in names)
+        ]
+        if dropped:
+            self._library_lines = [span for span in self._library_lines if span not in dropped]
+            chunks = []
+            for chunk in self._chunks:
+                if isinstance(chunk, tuple):
+                    start, end = chunk
+                    for line_start, line_end in dropped:
+                        if start <= line_start and line_end <= end:
+                            chunks.append((start, line_start))
+                            start = line_end
+                    chunks.append((start, end))
+                else:
+                    chunks.append(chunk)
+            self._chunks = chunks
+        count = len(dropped)
+
+        # Inside the build configurations drop list items, or the whole setting for a single value
+        for configuration in self.configurations.values():
+            for key, value in list(configuration.settings.items()):
+                if not any(library in value for library in libraries):
+                    continue
+                if value.startswith('('):
+                    lines = value.split('\n')
+                    kept = [line for line in lines if not any(library in line for library in libraries)]
+                    configuration.settings[key] = '\n'.join(kept)
+                    count += len(lines) - len(kept)
+                else:
+                    del configuration.settings[key]
+                    count += 1
+        return count
+
+def run(script, apply_configuration, backup_suffix, project_path=PROJECT_PATH):
+    """Apply a configure script to the project and return True if it changed, or None if it could not run"""
+    if not os.path.exists(project_path):
+        print(f"❌ Project file not found: {project_path}")
+        return None
+
+    if already_configured(project_path, script):
+        print("ℹ️  Project unchanged since the last run")
+        return False
+
+    try:
+        project = PBXProj(project_path)
+    except ValueError as error:
+        print(f"❌ {error}")
+        return None
+    modified = apply_configuration(project)
+
+    # Backup the original, as a hard link only when the project is about to be replaced
+    backup_path = project.backup(backup_suffix, link=modified)
+    print(f"💾 Created backup: {backup_path}")
+
+    if modified:
+        project.write()
+    else:
+        project.close()
+    mark_configured(project_path, script)
+    return modified
\ No newline at end of file